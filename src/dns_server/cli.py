@@ -1,36 +1,118 @@
 """CLI for the DNS server."""
 from __future__ import annotations
 
-import argparse
 import asyncio
+import sys
+from types import SimpleNamespace
 
-from .server import serve
+from .server import install_uvloop, serve
 
+_DEFAULTS: dict[str, str | int] = {
+    "config": "config.yaml",
+    "host": "127.0.0.1",
+    "port": 5353,
+    "log_level": "INFO",
+}
+_LOG_LEVELS = ("DEBUG", "INFO", "WARNING", "ERROR")
+_USAGE = (
+    "usage: dns-server [--help] [--config PATH] [--host ADDR] [--port PORT] "
+    "[--log-level LEVEL]"
+)
 
-def parse_args() -> argparse.Namespace:
-    """Parse command-line arguments.
 
-    Returns:
-        argparse.Namespace: Parsed CLI options:
-            - config (str): Path to YAML config file.
-            - host (str): Bind address.
-            - port (int): UDP port.
-            - log_level (str): Logging level.
+def _print_help() -> None:
+    """Print full help via argparse and exit.
+
+    argparse is imported lazily so it (and its transitive imports) stay off
+    the normal startup path and are only paid for when help is requested.
     """
+    import argparse
+
     parser = argparse.ArgumentParser(
+        prog="dns-server",
         description="Authoritative DNS server (YAML-backed)",
         formatter_class=argparse.ArgumentDefaultsHelpFormatter,
     )
-    parser.add_argument("--config", default="config.yaml", help="Path to YAML config")
-    parser.add_argument("--host", default="127.0.0.1", help="Bind address")
-    parser.add_argument("--port", type=int, default=5353, help="UDP port")
+    parser.add_argument("--config", default=_DEFAULTS["config"], help="Path to YAML config")
+    parser.add_argument("--host", default=_DEFAULTS["host"], help="Bind address")
+    parser.add_argument("--port", type=int, default=_DEFAULTS["port"], help="UDP port")
     parser.add_argument(
         "--log-level",
-        default="INFO",
-        choices=["DEBUG", "INFO", "WARNING", "ERROR"],
+        default=_DEFAULTS["log_level"],
+        choices=list(_LOG_LEVELS),
         help="Log level",
     )
-    return parser.parse_args()
+    parser.print_help()
+    raise SystemExit(0)
+
+
+def _fail(message: str) -> None:
+    """Report a usage error and exit with status 2 (argparse convention).
+
+    Args:
+        message: Error text printed after the usage line.
+    """
+    print(_USAGE, file=sys.stderr)
+    print(f"dns-server: error: {message}", file=sys.stderr)
+    raise SystemExit(2)
+
+
+def parse_args(argv: list[str] | None = None) -> SimpleNamespace:
+    """Parse command-line arguments with a minimal hand-rolled loop.
+
+    Recognizes the `--opt value` and `--opt=value` forms of --config,
+    --host, --port and --log-level. Keeping argparse off this path saves
+    its import and parser construction cost on every startup.
+
+    Args:
+        argv: Arguments to parse; defaults to `sys.argv[1:]`.
+
+    Returns:
+        types.SimpleNamespace: Parsed CLI options:
+            - config (str): Path to YAML config file.
+            - host (str): Bind address.
+            - port (int): UDP port.
+            - log_level (str): Logging level.
+    """
+    args = sys.argv[1:] if argv is None else argv
+    if "--help" in args or "-h" in args:
+        _print_help()
+
+    opts = dict(_DEFAULTS)
+    i = 0
+    while i < len(args):
+        arg = args[i]
+        if arg.startswith("--") and "=" in arg:
+            flag, value = arg.split("=", 1)
+        elif arg.startswith("--"):
+            flag = arg
+            if i + 1 >= len(args):
+                _fail(f"argument {flag}: expected one argument")
+            i += 1
+            value = args[i]
+        else:
+            _fail(f"unrecognized arguments: {arg}")
+        i += 1
+
+        key = flag[2:].replace("-", "_")
+        if key not in opts:
+            _fail(f"unrecognized arguments: {flag}")
+        if key == "port":
+            try:
+                opts["port"] = int(value)
+            except ValueError:
+                _fail(f"argument --port: invalid int value: {value!r}")
+        elif key == "log_level":
+            if value not in _LOG_LEVELS:
+                _fail(
+                    f"argument --log-level: invalid choice: {value!r} "
+                    f"(choose from {', '.join(map(repr, _LOG_LEVELS))})"
+                )
+            opts["log_level"] = value
+        else:
+            opts[key] = value
+
+    return SimpleNamespace(**opts)
 
 
 def main() -> None:
@@ -43,6 +125,7 @@ def main() -> None:
         None
     """
     args = parse_args()
+    install_uvloop()
     try:
         asyncio.run(serve(args.config, args.host, args.port, args.log_level))
     except (KeyboardInterrupt, SystemExit, SystemError):
@@ -1,28 +1,250 @@
 """Configuration loading and DNS record indexing."""
 from __future__ import annotations
 
-import ipaddress
+import asyncio
+import hashlib
 import logging
 import os
+import pickle
+import socket
+import struct
+import threading
+import time
+from array import array
+from functools import lru_cache, partial
+from itertools import chain
+from typing import Any, Callable, Sequence
 
 import yaml
-from dnslib import A, AAAA, CNAME, NS, PTR, TXT, DNSLabel, QTYPE, RR
+from dnslib import A, AAAA, CNAME, MX, NS, PTR, TXT, DNSLabel, QTYPE, RR
+from dnslib.dns import DNSBuffer
 
-from .records import Record
+try:  # optional: event-driven config reload (inotify/FSEvents-backed)
+    from watchfiles import awatch
+except ImportError:
+    awatch = None
 
 logger = logging.getLogger(__name__)
 
+# libyaml-backed loader when available (same exception hierarchy as SafeLoader).
+CSafeLoader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
 # Stable order for QTYPE.ANY responses.
-SUPPORTED_ORDER: tuple[str, ...] = ("A", "AAAA", "CNAME", "TXT", "NS", "PTR")
+SUPPORTED_ORDER: tuple[str, ...] = ("A", "AAAA", "CNAME", "MX", "TXT", "NS", "PTR")
 SUPPORTED_QTYPES: dict[str, int] = {
     "A": QTYPE.A,
     "AAAA": QTYPE.AAAA,
     "CNAME": QTYPE.CNAME,
+    "MX": QTYPE.MX,
     "TXT": QTYPE.TXT,
     "NS": QTYPE.NS,
     "PTR": QTYPE.PTR,
 }
 
+# Rdata constructors and value validators keyed by numeric QTYPE; replaces
+# per-record string comparisons with a single integer dict lookup.
+_RDATA_BUILDERS: dict[int, Callable[[str], Any]] = {
+    QTYPE.A: A,
+    QTYPE.AAAA: AAAA,
+    QTYPE.CNAME: lambda v: CNAME(DNSLabel(v)),
+    QTYPE.TXT: TXT,
+    QTYPE.NS: lambda v: NS(DNSLabel(v)),
+    QTYPE.PTR: lambda v: PTR(DNSLabel(v)),
+}
+# inet_pton wraps libc's C parser and raises OSError on malformed addresses;
+# it is an order of magnitude cheaper than constructing ipaddress objects.
+_VALIDATORS: dict[int, Callable[[str], Any]] = {
+    QTYPE.A: partial(socket.inet_pton, socket.AF_INET),
+    QTYPE.AAAA: partial(socket.inet_pton, socket.AF_INET6),
+}
+
+# Shared empty result for index misses; avoids allocating per-query lists.
+_EMPTY: tuple[RR, ...] = ()
+
+# Upper bound on memoized lookup results kept between reloads.
+_LOOKUP_CACHE_SIZE = 4096
+
+# Upper bound on cached packed responses; bounds memory under random-qname
+# floods while leaving plenty of room for any real hot set.
+RESPONSE_CACHE_SIZE = 4096
+
+# Bump when the snapshot layout changes so stale cache files are ignored.
+_SNAPSHOT_VERSION = 7
+
+# Minimum seconds between config stat() probes from the datagram path.
+_STAT_INTERVAL = 1.0
+
+# Attributes persisted in (and restored from) the binary snapshot.
+_STATE_FIELDS: tuple[str, ...] = (
+    "default_ttl",
+    "names",
+    "names_lc",
+    "rtypes",
+    "rtype_codes",
+    "values",
+    "ttls",
+    "mx_prios",
+    "mx_hosts",
+    "index",
+    "_rr_index",
+    "_any_index",
+    "_wire_index",
+    "_any_wire_index",
+    "_glue_rrs",
+    "_glue_wire",
+    "_wildcard_parents",
+    "_wildcard_parents_wire",
+    "_ptr_wire_index",
+    "_ptr_any_wire_index",
+)
+
+
+# Empty wire lookup result shared across misses.
+_EMPTY_WIRE: tuple[bytes, int, bytes, int] = (b"", 0, b"", 0)
+
+# Header-tail packer (flags, qdcount, ancount, nscount, arcount) used when
+# priming the response cache; mirrors the layout the protocol layer splices.
+_pack_hdr_tail = struct.Struct(">HHHHH").pack
+
+# ASCII-only lowercase table; applied with bytes.translate so case folding of
+# query names runs as a single C-level pass and leaves non-letter octets alone.
+_LOWER_TBL = bytes(b + 0x20 if 0x41 <= b <= 0x5A else b for b in range(256))
+
+
+def _make_rr(label: DNSLabel, rtype_code: int, rdata: Any, ttl: int, _RR: type[RR] = RR) -> RR:
+    """Construct an IN-class `RR` with purely positional arguments.
+
+    Binding `RR` as a default argument lifts the global into a local and the
+    positional call skips CPython's keyword-binding path; rclass is always
+    1 (IN) for this server.
+
+    Args:
+        label: Owner name.
+        rtype_code: Numeric `dnslib.QTYPE` code.
+        rdata: Prepared rdata object.
+        ttl: Record TTL in seconds.
+        _RR: Bound `RR` class; not meant to be overridden.
+
+    Returns:
+        The constructed resource record.
+    """
+    return _RR(label, rtype_code, 1, ttl, rdata)
+
+
+def _encode_name(label: DNSLabel) -> bytes:
+    """Encode a DNS name in uncompressed wire format.
+
+    Args:
+        label: Parsed DNS name.
+
+    Returns:
+        Length-prefixed label sequence terminated by a zero octet.
+    """
+    return b"".join(bytes((len(part),)) + part for part in label.label) + b"\x00"
+
+
+# Direct RDATA serializers per numeric QTYPE, used in place of dnslib's
+# generic DNSBuffer packing when blobs are built at load: each touches only
+# the fields its type actually has. TXT splits into 255-octet strings as
+# the wire format requires.
+_RDATA_WIRE: dict[int, Callable[[Any], bytes]] = {
+    QTYPE.A: lambda rd: bytes(rd.data),
+    QTYPE.AAAA: lambda rd: bytes(rd.data),
+    QTYPE.CNAME: lambda rd: _encode_name(rd.label),
+    QTYPE.NS: lambda rd: _encode_name(rd.label),
+    QTYPE.PTR: lambda rd: _encode_name(rd.label),
+    QTYPE.MX: lambda rd: struct.pack(">H", rd.preference) + _encode_name(rd.label),
+    QTYPE.TXT: lambda rd: b"".join(
+        bytes((len(chunk),)) + chunk
+        for txt in rd.data
+        for chunk in (txt[i : i + 255] for i in range(0, len(txt) or 1, 255))
+    ),
+}
+
+
+def _rdata_bytes(rr: RR) -> bytes:
+    """Emit the RDATA wire bytes for one supported `RR`.
+
+    Args:
+        rr: Resource record whose rdata to serialize.
+
+    Returns:
+        Raw RDATA bytes without the rdlength prefix.
+    """
+    emit = _RDATA_WIRE.get(rr.rtype)
+    if emit is not None:
+        return emit(rr.rdata)
+    # Unreachable for records built from config, but keep dnslib's generic
+    # packer as a safety net.
+    rdbuf = DNSBuffer()
+    rr.rdata.pack(rdbuf)
+    return bytes(rdbuf.data)
+
+
+def _rr_wire(rr: RR) -> bytes:
+    """Serialize one `RR` to wire bytes with an uncompressed owner name.
+
+    Compression pointers are deliberately avoided so the result can be
+    spliced into a response at any offset.
+
+    Args:
+        rr: Resource record to serialize.
+
+    Returns:
+        Complete wire-format RR (name, type, class, TTL, rdlength, rdata).
+    """
+    rdata = _rdata_bytes(rr)
+    return (
+        _encode_name(rr.rname)
+        + struct.pack(">HHIH", rr.rtype, rr.rclass, rr.ttl, len(rdata))
+        + rdata
+    )
+
+
+def _rr_wire_ptr(rr: RR) -> bytes:
+    """Serialize one `RR` with the owner as a pointer to the question name.
+
+    The 0xC00C pointer refers to offset 12 — the question name in a reply
+    with a standard header — so the same blob answers any query name. This
+    is what makes pre-packed wildcard answers possible: the synthesized
+    owner is whatever name the client asked for.
+
+    Args:
+        rr: Resource record to serialize.
+
+    Returns:
+        Wire-format RR whose owner is a compression pointer to offset 12.
+    """
+    rdata = _rdata_bytes(rr)
+    return b"\xc0\x0c" + struct.pack(">HHIH", rr.rtype, rr.rclass, rr.ttl, len(rdata)) + rdata
+
+
+def _label_bytes(label: DNSLabel) -> bytes:
+    """Return the lowercased dotted-bytes form of a `DNSLabel`.
+
+    Args:
+        label: Parsed DNS name.
+
+    Returns:
+        Lowercased FQDN as bytes with a trailing dot (index key form).
+    """
+    return (b".".join(label.label) + b".").translate(_LOWER_TBL)
+
+
+def _wire_name(name_lc: bytes) -> bytes:
+    """Convert a lowercased dotted name to wire format.
+
+    Args:
+        name_lc: Lowercased FQDN bytes with trailing dot (e.g. b"a.com.").
+
+    Returns:
+        Length-prefixed label sequence terminated by a zero octet — the
+        exact bytes a query carries in its question section, which lets the
+        protocol layer use them as index keys without any label parsing.
+    """
+    parts = name_lc.rstrip(b".").split(b".") if name_lc != b"." else []
+    return b"".join(bytes((len(part),)) + part for part in parts if part) + b"\x00"
+
 
 class Config:
     """Parsed configuration with indexed DNS records.
@@ -30,13 +252,56 @@ class Config:
     Args:
         path: Filesystem path to the YAML configuration.
 
+    Records are stored struct-of-arrays style: parallel tuples indexed by
+    row number, with `index` mapping lookup keys to row ids. Tuples (and a
+    C unsigned-int array for TTLs) avoid one heap object per record on
+    large zones and keep row scans cache-friendly.
+
     Attributes:
         path: Path to the YAML config file.
         default_ttl: Default TTL applied to records without explicit TTL.
-        records: Linear list of parsed records.
-        index: Lookup index keyed by (fqdn_lower, rtype).
+        names: Record FQDNs as written in the config (row-parallel).
+        names_lc: Lowercased ASCII bytes form of each name (row-parallel).
+        rtypes: Record type names (row-parallel).
+        rtype_codes: Numeric `dnslib.QTYPE` codes (row-parallel).
+        values: Record values (row-parallel).
+        ttls: Record TTLs in seconds (row-parallel, `array('I')`).
+        mx_prios: Parsed MX preference per row, None for non-MX rows.
+        mx_hosts: Parsed MX exchange label per row, None for non-MX rows.
+        index: Row ids keyed by (fqdn_lower_bytes, rtype).
     """
 
+    __slots__ = (
+        "path",
+        "_mtime",
+        "_next_stat_at",
+        "_content_hash",
+        "default_ttl",
+        "names",
+        "names_lc",
+        "rtypes",
+        "rtype_codes",
+        "values",
+        "ttls",
+        "mx_prios",
+        "mx_hosts",
+        "index",
+        "_rr_index",
+        "_any_index",
+        "_wire_index",
+        "_any_wire_index",
+        "_glue_rrs",
+        "_glue_wire",
+        "_wildcard_parents",
+        "_wildcard_parents_wire",
+        "_ptr_wire_index",
+        "_ptr_any_wire_index",
+        "_lookup_cached",
+        "response_cache",
+        "_watch_task",
+        "_load_lock",
+    )
+
     def __init__(self, path: str) -> None:
         """Initialize and load configuration.
 
@@ -45,14 +310,43 @@ class Config:
         """
         self.path = path
         self._mtime = 0.0
+        self._next_stat_at = 0.0
+        self._content_hash = b""
         self.default_ttl = 300
-        self.records: list[Record] = []
-        self.index: dict[tuple[str, str], list[Record]] = {}
+        self.names: tuple[str, ...] = ()
+        self.names_lc: tuple[bytes, ...] = ()
+        self.rtypes: tuple[str, ...] = ()
+        self.rtype_codes: tuple[int, ...] = ()
+        self.values: tuple[str, ...] = ()
+        self.ttls: array[int] = array("I")
+        self.mx_prios: tuple[int | None, ...] = ()
+        self.mx_hosts: tuple[DNSLabel | None, ...] = ()
+        self.index: dict[tuple[bytes, str], tuple[int, ...]] = {}
+        self._rr_index: dict[tuple[bytes, str], tuple[RR, ...]] = {}
+        self._any_index: dict[bytes, tuple[tuple[RR, ...], tuple[RR, ...]]] = {}
+        self._wire_index: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        self._any_wire_index: dict[bytes, tuple[bytes, int, bytes, int]] = {}
+        self._glue_rrs: dict[tuple[bytes, str], tuple[RR, ...]] = {}
+        self._glue_wire: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        self._wildcard_parents: dict[bytes, bytes] = {}
+        self._wildcard_parents_wire: dict[bytes, bytes] = {}
+        self._ptr_wire_index: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        self._ptr_any_wire_index: dict[bytes, tuple[bytes, int, bytes, int]] = {}
+        self._lookup_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(self._lookup_uncached)
+        # Packed replies keyed by (qname_wire_lc, qtype); filled lazily by
+        # the protocol layer and dropped wholesale on reload.
+        self.response_cache: dict[tuple[bytes, int], tuple[bytes, bytes]] = {}
+        self._watch_task: asyncio.Task[None] | None = None
+        self._load_lock = threading.Lock()
         self.load(force=True)
 
     def load(self, force: bool = False) -> None:
         """Load or reload YAML configuration.
 
+        Serialized behind a lock: serve_sync threads all poll
+        `maybe_reload`, and concurrent loads interleaving their attribute
+        assignments would expose readers to mixed index generations.
+
         Args:
             force: Reload regardless of file mtime.
 
@@ -60,6 +354,11 @@ class Config:
             ValueError: On invalid YAML structure or record data.
             FileNotFoundError: If the config is missing and `force=True`.
         """
+        with self._load_lock:
+            self._load(force)
+
+    def _load(self, force: bool) -> None:
+        """Do the actual (re)load; caller holds `_load_lock`."""
         try:
             st = os.stat(self.path)
         except FileNotFoundError:
@@ -70,9 +369,30 @@ class Config:
         if not force and st.st_mtime <= self._mtime:
             return
 
+        with open(self.path, "rb") as f:
+            blob = f.read()
+
+        # Byte-identical rewrites (touch, re-rendered templates) skip the
+        # whole parse; only the cheap C-implemented hash runs.
+        digest = hashlib.blake2b(blob, digest_size=16).digest()
+        if not force and digest == self._content_hash:
+            self._mtime = st.st_mtime
+            return
+
+        state = self._load_snapshot(digest)
+        if state is not None:
+            for field in _STATE_FIELDS:
+                setattr(self, field, state[field])
+            self._lookup_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(self._lookup_uncached)
+            self.response_cache = {}
+            self._prime_response_cache()
+            self._mtime = st.st_mtime
+            self._content_hash = digest
+            logger.info("configuration restored from snapshot: %d records", len(self.names))
+            return
+
         try:
-            with open(self.path, "r", encoding="utf-8") as f:
-                data = yaml.safe_load(f) or {}
+            data = yaml.load(blob, Loader=CSafeLoader) or {}
         except yaml.YAMLError as exc:
             raise ValueError(f"YAML parsing error: {exc}") from exc
 
@@ -85,7 +405,14 @@ class Config:
         if not isinstance(raw, list):
             raise ValueError("'records' must be a list")
 
-        recs: list[Record] = []
+        names: list[str] = []
+        names_lc: list[bytes] = []
+        rtypes: list[str] = []
+        rtype_codes: list[int] = []
+        values: list[str] = []
+        ttls: list[int] = []
+        mx_prios: list[int | None] = []
+        mx_hosts: list[DNSLabel | None] = []
         for i, item in enumerate(raw, 1):
             if not isinstance(item, dict):
                 raise ValueError(f"record #{i}: mapping required, got {type(item).__name__}")
@@ -97,105 +424,521 @@ class Config:
             except (KeyError, TypeError, ValueError) as exc:
                 raise ValueError(f"malformed record #{i}: {exc}") from exc
 
+            if not 0 <= ttl < 2**32:
+                raise ValueError(f"record #{i}: ttl out of range (got {ttl})")
             if not name.endswith("."):
                 raise ValueError(f"record #{i}: name must end with '.' (got {name!r})")
             if rtype not in SUPPORTED_QTYPES:
                 raise ValueError(f"record #{i}: unsupported type '{rtype}'")
 
-            recs.append(Record(name=name, rtype=rtype, value=value, ttl=ttl))
-
-        index: dict[tuple[str, str], list[Record]] = {}
-        for rec in recs:
-            index.setdefault((rec.name.lower(), rec.rtype), []).append(rec)
-
-        self.records = recs
+            # Parse "<preference> <exchange.>" once at load so MX errors
+            # surface here instead of being skipped at RR build time.
+            mx_prio: int | None = None
+            mx_host: DNSLabel | None = None
+            if rtype == "MX":
+                try:
+                    prio_str, host = value.split(maxsplit=1)
+                    mx_prio = int(prio_str)
+                except ValueError as exc:
+                    raise ValueError(f"record #{i}: invalid MX value {value!r}") from exc
+                if not host.endswith("."):
+                    raise ValueError(f"record #{i}: MX host must end with '.' (got {host!r})")
+                mx_host = DNSLabel(host)
+
+            names.append(name)
+            names_lc.append(name.encode("ascii").lower())
+            rtypes.append(rtype)
+            rtype_codes.append(SUPPORTED_QTYPES[rtype])
+            values.append(value)
+            ttls.append(ttl)
+            mx_prios.append(mx_prio)
+            mx_hosts.append(mx_host)
+
+        # Inner containers are frozen to tuples: one allocation each, no
+        # over-allocation slack, and the read-only contract is enforced.
+        rows_by_key: dict[tuple[bytes, str], list[int]] = {}
+        for row, (name_lc, rtype) in enumerate(zip(names_lc, rtypes)):
+            rows_by_key.setdefault((name_lc, rtype), []).append(row)
+        index: dict[tuple[bytes, str], tuple[int, ...]] = {
+            key: tuple(rows) for key, rows in rows_by_key.items()
+        }
+
+        rr_index: dict[tuple[bytes, str], tuple[RR, ...]] = {}
+        for (name_lc, rtype), rows in index.items():
+            rr_index[(name_lc, rtype)] = tuple(
+                self._build_rrs(rtype, rows, names, values, ttls, mx_prios, mx_hosts)
+            )
+
+        # Additional-section glue (target A/AAAA records) for answer types
+        # that point at hosts is resolved and packed once per (owner, type)
+        # here, so the query path appends one pre-built list or blob.
+        glue_rrs: dict[tuple[bytes, str], tuple[RR, ...]] = {}
+        glue_wire: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        for (name_lc, rtype), rrs in rr_index.items():
+            if rtype not in ("CNAME", "NS", "MX") or not rrs:
+                continue
+            glue: tuple[RR, ...] = ()
+            for rr in rrs:
+                target = _label_bytes(rr.rdata.label)
+                glue += rr_index.get((target, "A"), _EMPTY)
+                glue += rr_index.get((target, "AAAA"), _EMPTY)
+            glue_rrs[(name_lc, rtype)] = glue
+            glue_wire[(_wire_name(name_lc), rtype)] = (
+                b"".join(_rr_wire(rr) for rr in glue),
+                len(glue),
+            )
+
+        any_index: dict[bytes, tuple[tuple[RR, ...], tuple[RR, ...]]] = {}
+        for name_lc in {name for name, _ in rr_index}:
+            answers: tuple[RR, ...] = tuple(
+                chain.from_iterable(rr_index.get((name_lc, t), _EMPTY) for t in SUPPORTED_ORDER)
+            )
+            # Glue targets can overlap (NS and MX on the same host); RR
+            # objects are shared with rr_index and unhashable, so dedupe by
+            # identity.
+            additionals: list[RR] = []
+            seen: set[int] = set()
+            for t in ("CNAME", "NS", "MX"):
+                for rr in glue_rrs.get((name_lc, t), _EMPTY):
+                    if id(rr) not in seen:
+                        seen.add(id(rr))
+                        additionals.append(rr)
+            any_index[name_lc] = (answers, tuple(additionals))
+
+        # The wire indexes are keyed by the wire-format question name, so
+        # the protocol layer can use raw datagram bytes as keys directly.
+        wire_index: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        for (name_lc, rtype), rrs in rr_index.items():
+            wire_index[(_wire_name(name_lc), rtype)] = (
+                b"".join(_rr_wire(rr) for rr in rrs),
+                len(rrs),
+            )
+
+
+        any_wire_index: dict[bytes, tuple[bytes, int, bytes, int]] = {}
+        for name_lc, (any_answers, any_additionals) in any_index.items():
+            any_wire_index[_wire_name(name_lc)] = (
+                b"".join(_rr_wire(rr) for rr in any_answers),
+                len(any_answers),
+                b"".join(_rr_wire(rr) for rr in any_additionals),
+                len(any_additionals),
+            )
+
+        # Wildcard owners ("*.example.com.") are matched by walking a missed
+        # query name's parent suffixes — one dict probe per stripped label,
+        # the same descent a reversed-label trie performs. Their RR sections
+        # are pre-packed with a 0xC00C owner pointer (the question name at
+        # offset 12) so replies carry the queried name without per-query
+        # serialization.
+        wildcard_parents: dict[bytes, bytes] = {}
+        for name_lc in {name for name, _ in rr_index}:
+            if name_lc.startswith(b"*."):
+                wildcard_parents[name_lc[2:]] = name_lc
+        wildcard_parents_wire = {
+            _wire_name(suffix): _wire_name(owner) for suffix, owner in wildcard_parents.items()
+        }
+
+        ptr_wire_index: dict[tuple[bytes, str], tuple[bytes, int]] = {}
+        for (name_lc, rtype), rrs in rr_index.items():
+            if name_lc.startswith(b"*."):
+                ptr_wire_index[(_wire_name(name_lc), rtype)] = (
+                    b"".join(_rr_wire_ptr(rr) for rr in rrs),
+                    len(rrs),
+                )
+
+        ptr_any_wire_index: dict[bytes, tuple[bytes, int, bytes, int]] = {}
+        for name_lc, (any_answers, any_additionals) in any_index.items():
+            if name_lc.startswith(b"*."):
+                ptr_any_wire_index[_wire_name(name_lc)] = (
+                    b"".join(_rr_wire_ptr(rr) for rr in any_answers),
+                    len(any_answers),
+                    b"".join(_rr_wire(rr) for rr in any_additionals),
+                    len(any_additionals),
+                )
+
+        # Swap atomically so concurrent lookups see either the old or the new
+        # index, never a half-built one.
+        self.names = tuple(names)
+        self.names_lc = tuple(names_lc)
+        self.rtypes = tuple(rtypes)
+        self.rtype_codes = tuple(rtype_codes)
+        self.values = tuple(values)
+        self.ttls = array("I", ttls)
+        self.mx_prios = tuple(mx_prios)
+        self.mx_hosts = tuple(mx_hosts)
         self.index = index
+        self._rr_index = rr_index
+        self._any_index = any_index
+        self._wire_index = wire_index
+        self._any_wire_index = any_wire_index
+        self._glue_rrs = glue_rrs
+        self._glue_wire = glue_wire
+        self._wildcard_parents = wildcard_parents
+        self._wildcard_parents_wire = wildcard_parents_wire
+        self._ptr_wire_index = ptr_wire_index
+        self._ptr_any_wire_index = ptr_any_wire_index
+        self._lookup_cached = lru_cache(maxsize=_LOOKUP_CACHE_SIZE)(self._lookup_uncached)
+        self.response_cache = {}
+        self._prime_response_cache()
         self._mtime = st.st_mtime
-        logger.info("configuration loaded: %d records", len(self.records))
+        self._content_hash = digest
+        self._save_snapshot(digest)
+        logger.info("configuration loaded: %d records", len(self.names))
+
+    def _prime_response_cache(self) -> None:
+        """Pre-fill packed reply tails for every configured (name, qtype).
+
+        With the cache warm at load time, even the first query for a name
+        is served by one dict probe and a splice — replies cannot be stored
+        as whole frames because the question section must echo the
+        client's 0x20 case, so entries hold the (header tail, RR sections)
+        pair the protocol layer wraps around the request's own bytes.
+        Negative entries are left to fill lazily; they all share one
+        constant tail anyway. Priming stops at the cache cap on oversized
+        zones.
+
+        Returns:
+            None
+        """
+        cache = self.response_cache
+        codes = tuple(SUPPORTED_QTYPES.values()) + (QTYPE.ANY,)
+        for name_wire in {wire for wire, _ in self._wire_index}:
+            for code in codes:
+                if len(cache) >= RESPONSE_CACHE_SIZE:
+                    return
+                answers, ancount, additionals, arcount = self.lookup_wire(name_wire, code)
+                if ancount:
+                    cache[(name_wire, code)] = (
+                        _pack_hdr_tail(0x8400, 1, ancount, 0, arcount),
+                        answers + additionals,
+                    )
+
+    def _load_snapshot(self, digest: bytes) -> dict[str, Any] | None:
+        """Read the pickled index snapshot if it matches the config bytes.
+
+        Args:
+            digest: blake2b digest of the current config file contents.
+
+        Returns:
+            Saved state fields, or None when the snapshot is missing, stale
+            or unreadable (all treated as a plain cache miss).
+        """
+        try:
+            with open(self.path + ".cache", "rb") as f:
+                version, stored_digest, state = pickle.load(f)
+        except Exception:  # unpickling foreign bytes can raise almost anything
+            return None
+        if version != _SNAPSHOT_VERSION or stored_digest != digest:
+            return None
+        if not isinstance(state, dict) or any(field not in state for field in _STATE_FIELDS):
+            return None
+        return state
+
+    def _save_snapshot(self, digest: bytes) -> None:
+        """Persist the built indexes next to the config, best effort.
+
+        Pickle protocol 5 restores bytes/list/dict structures in C, so a
+        later boot with an unchanged file skips YAML parsing and the whole
+        record-building pass. Failures only cost the fast path.
+
+        Args:
+            digest: blake2b digest of the config bytes the state came from.
+        """
+        state = {field: getattr(self, field) for field in _STATE_FIELDS}
+        try:
+            with open(self.path + ".cache", "wb") as f:
+                pickle.dump((_SNAPSHOT_VERSION, digest, state), f, protocol=5)
+        except (OSError, pickle.PicklingError) as exc:
+            logger.debug("could not write config snapshot: %s", exc)
 
     def maybe_reload(self) -> None:
         """Reload on mtime change; keep last good config on errors.
 
+        Polling fallback for environments without a file watcher (see
+        `start_watcher`). Called per datagram, so the stat() probe itself is
+        throttled to once per `_STAT_INTERVAL` — between probes this is a
+        single monotonic-clock comparison with no syscalls.
+
         Returns:
             None
         """
+        now = time.monotonic()
+        if now < self._next_stat_at:
+            return
+        self._next_stat_at = now + _STAT_INTERVAL
         try:
             self.load(force=False)
         except (ValueError, yaml.YAMLError, OSError) as exc:
             logger.error("failed to reload configuration: %s", exc)
 
-    def _to_rrs(self, name_lc: str, rtype: str) -> list[RR]:
-        """Build `dnslib.RR` for a (name, rtype) pair.
+    def start_watcher(self, loop: asyncio.AbstractEventLoop) -> asyncio.Task[None] | None:
+        """Start event-driven config reloading if `watchfiles` is installed.
 
-        Malformed entries are skipped with a warning.
+        The watcher reacts to kernel file events (inotify/FSEvents) with a
+        100 ms debounce, collapsing editor save bursts into one reload. When
+        `watchfiles` is unavailable, returns None and callers keep relying
+        on the `maybe_reload` polling path.
+
+        Args:
+            loop: Event loop to schedule the watcher task on.
+
+        Returns:
+            The watcher task, or None when watching is not available.
+        """
+        if awatch is None:
+            logger.debug("watchfiles not installed; falling back to mtime polling")
+            return None
+
+        async def _watch() -> None:
+            async for _ in awatch(self.path, debounce=100):
+                try:
+                    self.load(force=True)
+                except (ValueError, OSError) as exc:
+                    logger.error("failed to reload configuration: %s", exc)
+
+        self._watch_task = loop.create_task(_watch())
+        logger.info("watching %s for changes", self.path)
+        return self._watch_task
+
+    def _build_rrs(
+        self,
+        rtype: str,
+        rows: Sequence[int],
+        names: list[str],
+        values: list[str],
+        ttls: list[int],
+        mx_prios: list[int | None],
+        mx_hosts: list[DNSLabel | None],
+    ) -> list[RR]:
+        """Build `dnslib.RR` objects for one (name, rtype) index entry.
+
+        Runs once per entry at load time; malformed entries are skipped with
+        a warning so they are logged once, not on every query.
 
         Args:
-            name_lc: Lowercased FQDN (with trailing dot).
             rtype: Record type name (e.g., "A", "AAAA").
+            rows: Row ids sharing the same (name, rtype) key.
+            names: Row-parallel record names.
+            values: Row-parallel record values.
+            ttls: Row-parallel record TTLs.
+            mx_prios: Row-parallel parsed MX preferences.
+            mx_hosts: Row-parallel parsed MX exchange labels.
 
         Returns:
             List of `RR` objects for the given key.
         """
+        code = SUPPORTED_QTYPES[rtype]
+        if code == QTYPE.MX:
+            # MX values were parsed and validated during the YAML walk.
+            return [
+                _make_rr(DNSLabel(names[row]), code, MX(mx_hosts[row], mx_prios[row]), ttls[row])
+                for row in rows
+            ]
+        builder = _RDATA_BUILDERS[code]
+        validator = _VALIDATORS.get(code)
         out: list[RR] = []
-        for rec in self.index.get((name_lc, rtype), []):
-            label = DNSLabel(rec.name)
+        for row in rows:
+            value = values[row]
+            ttl = ttls[row]
+            label = DNSLabel(names[row])
             try:
-                if rtype == "A":
-                    ipaddress.IPv4Address(rec.value)
-                    out.append(RR(label, QTYPE.A, rdata=A(rec.value), ttl=rec.ttl))
-                elif rtype == "AAAA":
-                    ipaddress.IPv6Address(rec.value)
-                    out.append(RR(label, QTYPE.AAAA, rdata=AAAA(rec.value), ttl=rec.ttl))
-                elif rtype == "CNAME":
-                    out.append(RR(label, QTYPE.CNAME, rdata=CNAME(DNSLabel(rec.value)), ttl=rec.ttl))
-                elif rtype == "TXT":
-                    out.append(RR(label, QTYPE.TXT, rdata=TXT(rec.value), ttl=rec.ttl))
-                elif rtype == "NS":
-                    out.append(RR(label, QTYPE.NS, rdata=NS(DNSLabel(rec.value)), ttl=rec.ttl))
-                elif rtype == "PTR":
-                    out.append(RR(label, QTYPE.PTR, rdata=PTR(DNSLabel(rec.value)), ttl=rec.ttl))
-            except ipaddress.AddressValueError:
-                logger.warning("invalid IP skipped: %s %s", rtype, rec.value)
+                if validator is not None:
+                    validator(value)
+                out.append(_make_rr(label, code, builder(value), ttl))
+            except OSError:
+                logger.warning("invalid IP skipped: %s %s", rtype, value)
             except (ValueError, IndexError):
-                logger.warning("invalid record skipped: %s %s", rtype, rec.value)
+                logger.warning("invalid record skipped: %s %s", rtype, value)
             except Exception as exc:  # last-resort guard
-                logger.warning("unexpected error for %s %s: %s", rtype, rec.value, exc)
+                logger.warning("unexpected error for %s %s: %s", rtype, value, exc)
         return out
 
-    def lookup(self, qname: DNSLabel, qtype: int) -> tuple[list[RR], list[RR]]:
+    def _to_rrs(self, name_lc: bytes, rtype: str) -> tuple[RR, ...]:
+        """Fetch precomputed `dnslib.RR` for a (name, rtype) pair.
+
+        Args:
+            name_lc: Lowercased FQDN (with trailing dot).
+            rtype: Record type name (e.g., "A", "AAAA").
+
+        Returns:
+            Cached RRs for the given key; callers must not mutate the result.
+        """
+        return self._rr_index.get((name_lc, rtype), _EMPTY)
+
+    def _match_wildcard(self, name_lc: bytes) -> bytes | None:
+        """Find the closest wildcard owner covering a missed name.
+
+        Strips leading labels one at a time and probes the wildcard parent
+        map — the reversed-label trie descent flattened into suffix dict
+        lookups. Only proper suffixes are checked, so "*.a.com." matches
+        "x.a.com." and "y.x.a.com." but never "a.com." itself.
+
+        Args:
+            name_lc: Lowercased dotted FQDN bytes (with trailing dot).
+
+        Returns:
+            Lowercased dotted wildcard owner (e.g. b"*.a.com."), or None.
+        """
+        parents = self._wildcard_parents
+        if not parents:
+            return None
+        idx = name_lc.find(b".")
+        while 0 <= idx < len(name_lc) - 1:
+            hit = parents.get(name_lc[idx + 1:])
+            if hit is not None:
+                return hit
+            idx = name_lc.find(b".", idx + 1)
+        return None
+
+    def _match_wildcard_wire(self, qname_wire: bytes) -> bytes | None:
+        """Wire-format counterpart of `_match_wildcard`.
+
+        Args:
+            qname_wire: Lowercased wire-format qname (length-prefixed labels
+                with terminating zero octet).
+
+        Returns:
+            Wire-format wildcard owner name, or None.
+        """
+        parents = self._wildcard_parents_wire
+        if not parents:
+            return None
+        pos = 0
+        while qname_wire[pos]:
+            pos += 1 + qname_wire[pos]
+            hit = parents.get(qname_wire[pos:])
+            if hit is not None:
+                return hit
+        return None
+
+    def lookup(self, qname: DNSLabel, qtype: int) -> tuple[Sequence[RR], Sequence[RR]]:
         """Resolve records for the given query.
 
+        Normalizes the name and delegates to the memoized resolver, so
+        repeated queries for the hot set are one `lru_cache` dict probe.
+
         Args:
             qname: Queried domain name (FQDN label).
             qtype: Numeric DNS type (`dnslib.QTYPE`).
 
         Returns:
-            Tuple of (answers, additionals) as lists of `RR`.
+            Tuple of (answers, additionals) `RR` sequences. These are
+            shared cached objects; callers must not mutate them.
+        """
+        return self._lookup_cached(_label_bytes(qname), qtype)
+
+    def _lookup_uncached(self, name: bytes, qtype: int) -> tuple[Sequence[RR], Sequence[RR]]:
+        """Resolve one normalized query against the record indexes.
+
+        Wrapped by `lru_cache` in `__init__` (and re-wrapped on reload,
+        which drops all memoized results along with the old indexes);
+        callers go through `lookup`.
+
+        Args:
+            name: Lowercased dotted FQDN bytes (with trailing dot).
+            qtype: Numeric DNS type (`dnslib.QTYPE`).
+
+        Returns:
+            Tuple of (answers, additionals) `RR` sequences.
         """
-        name = str(qname).lower()
         answers: list[RR] = []
         additionals: list[RR] = []
 
         if qtype == QTYPE.ANY:
-            for t in SUPPORTED_ORDER:
-                answers.extend(self._to_rrs(name, t))
-            cname_targets = [str(rr.rdata.label) for rr in answers if rr.rtype == QTYPE.CNAME]
-            if cname_targets:
-                target = cname_targets[0].lower()
-                additionals.extend(self._to_rrs(target, "A"))
-                additionals.extend(self._to_rrs(target, "AAAA"))
-            return answers, additionals
+            bundle: tuple[Sequence[RR], Sequence[RR]] | None = self._any_index.get(name)
+            if bundle is None:
+                wname = self._match_wildcard(name)
+                if wname is not None:
+                    wbundle = self._any_index.get(wname)
+                    if wbundle:
+                        owner = DNSLabel(name)
+                        bundle = (
+                            [_make_rr(owner, rr.rtype, rr.rdata, rr.ttl) for rr in wbundle[0]],
+                            wbundle[1],
+                        )
+            return bundle if bundle else (answers, additionals)
 
         qtype_name = QTYPE.get(qtype)
         if qtype_name in SUPPORTED_QTYPES:
             answers.extend(self._to_rrs(name, qtype_name))
+            additionals.extend(self._glue_rrs.get((name, qtype_name), _EMPTY))
 
         if not answers:
             cname_rrs = self._to_rrs(name, "CNAME")
             if cname_rrs:
                 answers.extend(cname_rrs)
-                target = str(cname_rrs[0].rdata.label).lower()
-                additionals.extend(self._to_rrs(target, "A"))
-                additionals.extend(self._to_rrs(target, "AAAA"))
+                additionals.extend(self._glue_rrs.get((name, "CNAME"), _EMPTY))
+
+        # Wildcard synthesis applies only when the queried name has no
+        # records of any type (RFC 4592); existing names give NODATA.
+        if not answers and name not in self._any_index:
+            wname = self._match_wildcard(name)
+            if wname is not None:
+                src: list[RR] | tuple[RR, ...] = _EMPTY
+                if qtype_name in SUPPORTED_QTYPES:
+                    src = self._to_rrs(wname, qtype_name)
+                    additionals.extend(self._glue_rrs.get((wname, qtype_name), _EMPTY))
+                if not src:
+                    src = self._to_rrs(wname, "CNAME")
+                    if src:
+                        additionals.extend(self._glue_rrs.get((wname, "CNAME"), _EMPTY))
+                owner = DNSLabel(name)
+                answers.extend(_make_rr(owner, rr.rtype, rr.rdata, rr.ttl) for rr in src)
 
         return answers, additionals
+
+    def lookup_wire(self, qname_wire: bytes, qtype: int) -> tuple[bytes, int, bytes, int]:
+        """Resolve a query to pre-serialized wire-format record sections.
+
+        Mirrors `lookup` but is keyed by the lowercased wire-format question
+        name — the bytes a request already carries — and returns sections
+        packed once at load time, so the response path needs neither label
+        parsing nor per-query RR packing.
+
+        Args:
+            qname_wire: Lowercased wire-format qname (length-prefixed labels
+                with terminating zero octet).
+            qtype: Numeric DNS type (`dnslib.QTYPE`).
+
+        Returns:
+            Tuple of (answers_wire, ancount, additionals_wire, arcount).
+        """
+        if qtype == QTYPE.ANY:
+            bundle = self._any_wire_index.get(qname_wire)
+            if bundle is None:
+                wname = self._match_wildcard_wire(qname_wire)
+                if wname is not None:
+                    bundle = self._ptr_any_wire_index.get(wname)
+            return bundle if bundle is not None else _EMPTY_WIRE
+
+        answers = b""
+        ancount = 0
+        additionals = b""
+        arcount = 0
+        qtype_name = QTYPE.get(qtype)
+        if qtype_name in SUPPORTED_QTYPES:
+            answers, ancount = self._wire_index.get((qname_wire, qtype_name), (b"", 0))
+            if ancount:
+                additionals, arcount = self._glue_wire.get((qname_wire, qtype_name), (b"", 0))
+
+        if not ancount:
+            answers, ancount = self._wire_index.get((qname_wire, "CNAME"), (b"", 0))
+            if ancount:
+                additionals, arcount = self._glue_wire.get((qname_wire, "CNAME"), (b"", 0))
+
+        # Wildcard synthesis applies only when the queried name has no
+        # records of any type (RFC 4592); existing names give NODATA. The
+        # pointer-owner blobs already carry the queried name by reference.
+        if not ancount and qname_wire not in self._any_wire_index:
+            wname = self._match_wildcard_wire(qname_wire)
+            if wname is not None:
+                if qtype_name in SUPPORTED_QTYPES:
+                    answers, ancount = self._ptr_wire_index.get((wname, qtype_name), (b"", 0))
+                    if ancount:
+                        additionals, arcount = self._glue_wire.get((wname, qtype_name), (b"", 0))
+                if not ancount:
+                    answers, ancount = self._ptr_wire_index.get((wname, "CNAME"), (b"", 0))
+                    if ancount:
+                        additionals, arcount = self._glue_wire.get((wname, "CNAME"), (b"", 0))
+
+        return answers, ancount, additionals, arcount
@@ -2,67 +2,319 @@
 from __future__ import annotations
 
 import asyncio
+import ctypes
+import errno
 import logging
+import socket
+import struct
+import sys
 from typing import Any
 
 from dnslib import DNSHeader, DNSRecord, QTYPE, RCODE
 from dnslib.dns import DNSError
 
-from .config import Config
+from .config import Config, RESPONSE_CACHE_SIZE, _LOWER_TBL
 
 logger = logging.getLogger(__name__)
 
+_HDR_FIELDS = struct.Struct(">HHHHH")  # flags, qdcount, ancount, nscount, arcount
+_QTAIL = struct.Struct(">HH")  # qtype, qclass
 
-class DNSUDPProtocol(asyncio.DatagramProtocol):
-    """Authoritative DNS handler over UDP.
+# Datagrams drained per reader wakeup; bounded to keep latency fair across
+# sockets under sustained load.
+_RECV_BATCH = 32
+
+# Largest request datagram accepted into a receive buffer.
+_MAX_DGRAM = 4096
+
+# Shared cache entry for negative answers: flags QR|AA|NXDOMAIN, one
+# question, no records. Misses for unknown names — the whole key space a
+# random-qname flood can generate — reuse this one tuple instead of
+# packing a header apiece.
+_NXDOMAIN_CACHED = (_HDR_FIELDS.pack(0x8403, 1, 0, 0, 0), b"")
+
+# Header tail for FORMERR replies to unparseable queries: flags QR|FORMERR,
+# all sections empty. Only the client's id is echoed in front of it.
+_FORMERR_TAIL = _HDR_FIELDS.pack(0x8001, 0, 0, 0, 0)
+
+# Concurrent dnslib slow-path tasks allowed in the asyncio front end before
+# further odd packets are dropped; bounds memory under malformed floods.
+_SLOW_TASK_LIMIT = 256
+
+# sendmmsg(2) lets the batched reader flush a whole wakeup's replies with a
+# single syscall. Python does not expose it, so it is bound via ctypes on
+# Linux; everywhere else replies fall back to per-packet sendto.
+_sendmmsg: Any = None
+if sys.platform == "linux":
+
+    class _IoVec(ctypes.Structure):
+        _fields_ = (("iov_base", ctypes.c_void_p), ("iov_len", ctypes.c_size_t))
+
+    class _SockaddrIn(ctypes.Structure):
+        _fields_ = (
+            ("sin_family", ctypes.c_uint16),
+            ("sin_port", ctypes.c_uint16),
+            ("sin_addr", ctypes.c_uint8 * 4),
+            ("sin_zero", ctypes.c_uint8 * 8),
+        )
+
+    class _MsgHdr(ctypes.Structure):
+        _fields_ = (
+            ("msg_name", ctypes.c_void_p),
+            ("msg_namelen", ctypes.c_uint32),
+            ("msg_iov", ctypes.POINTER(_IoVec)),
+            ("msg_iovlen", ctypes.c_size_t),
+            ("msg_control", ctypes.c_void_p),
+            ("msg_controllen", ctypes.c_size_t),
+            ("msg_flags", ctypes.c_int),
+        )
+
+    class _MMsgHdr(ctypes.Structure):
+        _fields_ = (("msg_hdr", _MsgHdr), ("msg_len", ctypes.c_uint32))
+
+    try:
+        _sendmmsg = ctypes.CDLL(None, use_errno=True).sendmmsg
+    except (OSError, AttributeError):
+        pass
+
+
+def _send_batch(sock: socket.socket, outbox: list[tuple[bytes, Any]]) -> None:
+    """Send queued replies, using one sendmmsg syscall where available.
+
+    Falls back to per-packet sendto when sendmmsg is unavailable, for a
+    single reply (no batching win), or for non-IPv4 destinations. Send
+    failures follow UDP semantics: a full buffer drops the remainder.
+
+    Args:
+        sock: Bound UDP socket to send from.
+        outbox: (payload, address) pairs collected during one batch.
+    """
+    sent = 0
+    if _sendmmsg is not None and len(outbox) > 1 and all(
+        len(addr) == 2 for _, addr in outbox
+    ):
+        count = len(outbox)
+        iovecs = (_IoVec * count)()
+        addrs = (_SockaddrIn * count)()
+        hdrs = (_MMsgHdr * count)()
+        try:
+            for i, (payload, addr) in enumerate(outbox):
+                iovecs[i].iov_base = ctypes.cast(ctypes.c_char_p(payload), ctypes.c_void_p)
+                iovecs[i].iov_len = len(payload)
+                addrs[i].sin_family = socket.AF_INET
+                addrs[i].sin_port = socket.htons(addr[1])
+                addrs[i].sin_addr = (ctypes.c_uint8 * 4).from_buffer_copy(
+                    socket.inet_aton(addr[0])
+                )
+                hdr = hdrs[i].msg_hdr
+                hdr.msg_name = ctypes.cast(ctypes.byref(addrs[i]), ctypes.c_void_p)
+                hdr.msg_namelen = ctypes.sizeof(_SockaddrIn)
+                hdr.msg_iov = ctypes.pointer(iovecs[i])
+                hdr.msg_iovlen = 1
+        except OSError:
+            sent = 0  # unparseable address; let sendto report it below
+        else:
+            sent = _sendmmsg(sock.fileno(), hdrs, count, 0)
+            if sent == count:
+                return
+            if sent < 0:
+                err = ctypes.get_errno()
+                if err not in (errno.EAGAIN, errno.EWOULDBLOCK):
+                    logger.warning("sendmmsg failed: %s", errno.errorcode.get(err, err))
+                    return
+                sent = 0
+
+    for payload, addr in outbox[sent:]:
+        try:
+            sock.sendto(payload, addr)
+        except BlockingIOError:
+            logger.debug("send buffer full; dropping %d response(s)", len(outbox) - sent)
+            return
+        except OSError as exc:
+            logger.warning("failed to send response to %s: %s", addr, exc)
+        sent += 1
+
+
+def _parse_question(
+    data: bytes,
+    _unpack_hdr: Any = _HDR_FIELDS.unpack_from,
+    _unpack_qtail: Any = _QTAIL.unpack_from,
+) -> tuple[bytes, int, int] | None:
+    """Extract the question from a plain single-question query datagram.
+
+    Walks the question section with bounds checks only; no dnslib objects
+    are created. Anything unusual (responses, multiple questions, extra
+    sections such as EDNS OPT, compression pointers, non-IN class) returns
+    None so the caller takes the full parsing path. The struct methods are
+    bound as default arguments so each call skips the global and attribute
+    loads — this function runs once per datagram.
+
+    Args:
+        data: Raw datagram bytes.
+        _unpack_hdr: Bound header unpacker; not meant to be overridden.
+        _unpack_qtail: Bound qtype/qclass unpacker; not meant to be
+            overridden.
+
+    Returns:
+        (qname_wire, qtype, question_end) where qname_wire includes the
+        terminating zero octet and question_end is the offset just past the
+        question section, or None when the fast path does not apply.
+    """
+    if len(data) < 12:
+        return None
+    flags, qdcount, ancount, nscount, arcount = _unpack_hdr(data, 2)
+    # Reject responses and non-QUERY opcodes along with anything that has
+    # extra sections.
+    if flags & 0xF800 or qdcount != 1 or ancount or nscount or arcount:
+        return None
+
+    off = 12
+    end = len(data)
+    while True:
+        if off >= end:
+            return None
+        length = data[off]
+        if length == 0:
+            off += 1
+            break
+        if length & 0xC0:  # compression pointer in a question: take slow path
+            return None
+        off += 1 + length
+
+    if off + 4 > end:
+        return None
+    qtype, qclass = _unpack_qtail(data, off)
+    if qclass != 1:
+        return None
+    return data[12:off], qtype, off + 4
+
+
+class DNSResponder:
+    """Transport-independent DNS request handling.
+
+    Both UDP front ends (the asyncio `DatagramProtocol` and the raw
+    batched reader) delegate to `handle_into`, which owns the cached fast
+    path and the full dnslib fallback.
 
     Attributes:
-        transport: Active UDP transport or None until connected.
         config: Shared configuration and record index.
     """
 
     def __init__(self, config: Config) -> None:
-        """Initialize the protocol.
+        """Initialize the responder.
 
         Args:
             config: Loaded configuration backing responses.
         """
-        self.transport: asyncio.DatagramTransport | None = None
         self.config = config
+        # Snapshot of the effective level: even no-op logger.debug calls
+        # format-check their arguments, which costs a few microseconds per
+        # datagram. serve() configures logging before responders exist.
+        self._debug = logger.isEnabledFor(logging.DEBUG)
+        # Reusable reply buffer: replies are assembled in place and sent as
+        # a memoryview slice, avoiding a fresh bytes object per packet.
+        # Grown once if a reply ever exceeds it. Safe to reuse because both
+        # sendto paths copy the data out before returning control here.
+        self._scratch = bytearray(_MAX_DGRAM)
 
-    def connection_made(self, transport: asyncio.BaseTransport) -> None:
-        """Called by asyncio when the UDP socket is ready.
+    def handle_into(self, data: bytes, addr: Any) -> int:
+        """Assemble the reply for one request datagram into `_scratch`.
 
         Args:
-            transport: Created datagram transport.
+            data: Raw DNS message bytes.
+            addr: Client address tuple (used for logging only).
+
+        Returns:
+            Length of the reply written to `self._scratch`, or 0 when the
+            datagram is unparseable and must be dropped.
         """
-        self.transport = transport  # type: ignore[assignment]
-        sock = self.transport.get_extra_info("socket")
-        logger.info("UDP listening on %s", sock.getsockname() if sock else "?")
+        if self._debug:
+            logger.debug("received %d bytes from %s", len(data), addr)
+        self.config.maybe_reload()
+        n = self._fast_into(data)
+        if n:
+            return n
+        return self._slow_into(data, addr)
 
-    def datagram_received(self, data: bytes, addr: Any) -> None:
-        """Process a single DNS datagram.
+    def _fast_into(self, data: bytes) -> int:
+        """Try answering from the packed-reply cache and wire index.
 
         Args:
             data: Raw DNS message bytes.
-            addr: Client address tuple as provided by asyncio.
 
         Returns:
-            None
+            Reply length written to `self._scratch`, or 0 when the datagram
+            is not a plain single-question query and needs the full parser.
         """
-        logger.debug("received %d bytes from %s", len(data), addr)
-        self.config.maybe_reload()
+        config = self.config
+        # Fast path: repeat queries are answered by splicing a cached packed
+        # reply around the request's own id and question bytes, so the hot
+        # set never touches dnslib.
+        parsed = _parse_question(data)
+        if parsed is not None:
+            qname_wire, qtype, qend = parsed
+            key = (qname_wire.translate(_LOWER_TBL), qtype)
+            cache = config.response_cache
+            cached = cache.get(key)
+            if cached is None:
+                # Build the flag/count and record sections from the wire
+                # index; no dnslib objects are involved.
+                answers, ancount, additionals, arcount = config.lookup_wire(key[0], qtype)
+                if ancount:
+                    hdr_tail = _HDR_FIELDS.pack(0x8400, 1, ancount, 0, arcount)
+                    cached = (hdr_tail, answers + additionals)
+                else:
+                    cached = _NXDOMAIN_CACHED
+                if len(cache) < RESPONSE_CACHE_SIZE:
+                    cache[key] = cached
+            hdr_tail, rr_tail = cached
+            n = qend + len(rr_tail)
+            scratch = self._scratch
+            if n > len(scratch):
+                scratch = self._scratch = bytearray(n)
+            scratch[:2] = data[:2]
+            scratch[2:12] = hdr_tail
+            scratch[12:qend] = data[12:qend]
+            scratch[qend:n] = rr_tail
+            return n
+        return 0
 
+    def _slow_into(self, data: bytes, addr: Any) -> int:
+        """Answer via the full dnslib parse/build path.
+
+        Args:
+            data: Raw DNS message bytes.
+            addr: Client address tuple (used for logging only).
+
+        Returns:
+            Reply length written to `self._scratch`, or 0 when the datagram
+            must be dropped.
+        """
+        # Never answer anything with QR set, parseable or not: replying to
+        # responses would let a reflected reply bounce between two servers
+        # indefinitely. (The fast path rejects these in _parse_question.)
+        if len(data) > 2 and data[2] & 0x80:
+            return 0
         try:
             request = DNSRecord.parse(data)
         except DNSError:
-            logger.debug("failed to parse request from %s", addr)
-            return
+            if self._debug:
+                logger.debug("failed to parse request from %s", addr)
+            # Malformed queries get a FORMERR echoing the id so legitimate
+            # clients can fail fast; truncated junk without a full header
+            # is still dropped.
+            if len(data) < 12:
+                return 0
+            scratch = self._scratch
+            scratch[:2] = data[:2]
+            scratch[2:12] = _FORMERR_TAIL
+            return 12
 
         reply = DNSRecord(DNSHeader(id=request.header.id, qr=1, aa=1, ra=0), q=request.q)
         qname = request.q.qname
         qtype = request.q.qtype
-        logger.debug("%s query: %s %s", addr, qname, QTYPE.get(qtype))
+        if self._debug:
+            logger.debug("%s query: %s %s", addr, qname, QTYPE.get(qtype))
 
         answers, additionals = self.config.lookup(qname, qtype)
         if answers:
@@ -73,8 +325,166 @@ class DNSUDPProtocol(asyncio.DatagramProtocol):
         else:
             reply.header.rcode = RCODE.NXDOMAIN
 
+        out = reply.pack()
+        n = len(out)
+        scratch = self._scratch
+        if n > len(scratch):
+            scratch = self._scratch = bytearray(n)
+        scratch[:n] = out
+        return n
+
+
+class DNSUDPProtocol(DNSResponder, asyncio.DatagramProtocol):
+    """Authoritative DNS handler over an asyncio datagram transport.
+
+    Attributes:
+        transport: Active UDP transport or None until connected.
+        config: Shared configuration and record index.
+    """
+
+    def __init__(self, config: Config) -> None:
+        """Initialize the protocol.
+
+        Args:
+            config: Loaded configuration backing responses.
+        """
+        super().__init__(config)
+        self.transport: asyncio.DatagramTransport | None = None
+        self._slow_pending = 0
+
+    def connection_made(self, transport: asyncio.BaseTransport) -> None:
+        """Called by asyncio when the UDP socket is ready.
+
+        Args:
+            transport: Created datagram transport.
+        """
+        self.transport = transport  # type: ignore[assignment]
+        sock = self.transport.get_extra_info("socket")
+        logger.info("UDP listening on %s", sock.getsockname() if sock else "?")
+
+    def datagram_received(self, data: bytes, addr: Any) -> None:
+        """Process a single DNS datagram.
+
+        Args:
+            data: Raw DNS message bytes.
+            addr: Client address tuple as provided by asyncio.
+
+        Returns:
+            None
+        """
+        if self._debug:
+            logger.debug("received %d bytes from %s", len(data), addr)
+        self.config.maybe_reload()
+
+        n = self._fast_into(data)
+        if n:
+            self._send(n, addr)
+            return
+
+        # Odd datagrams (EDNS OPT, multiple questions, malformed bytes) need
+        # the dnslib parser; run it in a task so the receive callback stays
+        # short and the socket keeps draining. The bound sheds load under
+        # malformed floods instead of queueing them.
+        if self._slow_pending >= _SLOW_TASK_LIMIT:
+            if self._debug:
+                logger.debug("slow-path backlog full; dropping packet from %s", addr)
+            return
+        self._slow_pending += 1
+        asyncio.ensure_future(self._slow_task(data, addr))
+
+    async def _slow_task(self, data: bytes, addr: Any) -> None:
+        """Answer one datagram via the full parser off the receive callback.
+
+        Args:
+            data: Raw DNS message bytes.
+            addr: Client address tuple as provided by asyncio.
+        """
+        try:
+            n = self._slow_into(data, addr)
+            if n:
+                self._send(n, addr)
+        finally:
+            self._slow_pending -= 1
+
+    def _send(self, n: int, addr: Any) -> None:
+        """Send the first `n` scratch-buffer bytes to a client.
+
+        Args:
+            n: Reply length in `self._scratch`.
+            addr: Destination address tuple.
+        """
         if self.transport:
             try:
-                self.transport.sendto(reply.pack(), addr)
+                # asyncio copies the payload when it has to buffer, so the
+                # scratch slice is safe to reuse on the next datagram.
+                self.transport.sendto(memoryview(self._scratch)[:n], addr)
             except (OSError, RuntimeError) as exc:
                 logger.warning("failed to send response to %s: %s", addr, exc)
+
+
+class DNSRawUDP(DNSResponder):
+    """Authoritative DNS handler draining a raw UDP socket in batches.
+
+    Registered with `loop.add_reader`, the handler drains up to
+    `_RECV_BATCH` datagrams per readiness wakeup instead of taking one
+    callback per packet, amortizing the Python dispatch overhead at high
+    packet rates. The batch bound preserves fairness between sockets.
+
+    Attributes:
+        sock: Bound non-blocking UDP socket.
+        config: Shared configuration and record index.
+    """
+
+    def __init__(self, config: Config, sock: socket.socket) -> None:
+        """Initialize the reader.
+
+        Args:
+            config: Loaded configuration backing responses.
+            sock: Bound non-blocking UDP socket to serve.
+        """
+        super().__init__(config)
+        self.sock = sock
+
+    def attach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Register the socket with the event loop.
+
+        Args:
+            loop: Event loop that will watch the socket for readability.
+        """
+        loop.add_reader(self.sock.fileno(), self._on_readable)
+        logger.info("UDP listening on %s", self.sock.getsockname())
+
+    def detach(self, loop: asyncio.AbstractEventLoop) -> None:
+        """Unregister the socket and close it.
+
+        Args:
+            loop: Event loop the socket was registered with.
+        """
+        loop.remove_reader(self.sock.fileno())
+        self.sock.close()
+
+    def _on_readable(self) -> None:
+        """Drain and answer pending datagrams, bounded per wakeup.
+
+        Returns:
+            None
+        """
+        sock = self.sock
+        handle_into = self.handle_into
+        # Replies are queued for the whole batch and flushed with a single
+        # sendmmsg call; each is snapshot out of the scratch buffer since
+        # the next datagram overwrites it.
+        outbox: list[tuple[bytes, Any]] = []
+        for _ in range(_RECV_BATCH):
+            try:
+                data, addr = sock.recvfrom(_MAX_DGRAM)
+            except (BlockingIOError, InterruptedError):
+                break
+            except OSError as exc:
+                logger.warning("recvfrom failed: %s", exc)
+                break
+            n = handle_into(data, addr)
+            if n:
+                outbox.append((bytes(memoryview(self._scratch)[:n]), addr))
+        if outbox:
+            _send_batch(sock, outbox)
@@ -3,23 +3,189 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import os
 import socket
+import sys
+import threading
 from typing import NoReturn
 
 from .config import Config
-from .protocol import DNSUDPProtocol
+from .protocol import DNSRawUDP, DNSResponder, _MAX_DGRAM
 
 
-async def serve(config_path: str, host: str, port: int, log_level: str = "INFO") -> NoReturn:
+def install_uvloop() -> bool:
+    """Install uvloop as the asyncio event loop policy when available.
+
+    Must be called before the event loop is created (i.e. before
+    `asyncio.run`); a running loop cannot be replaced. No-op on Windows or
+    when uvloop is not installed.
+
+    Returns:
+        bool: True if uvloop was installed.
+    """
+    if sys.platform == "win32":
+        return False
+    try:
+        import uvloop
+    except ImportError:
+        return False
+    uvloop.install()
+    return True
+
+
+# Requested kernel buffer sizes: a deep receive queue rides out bursts the
+# Python loop has not drained yet, the send side needs less headroom.
+_RCVBUF = 8 << 20
+_SNDBUF = 4 << 20
+
+
+def _make_socket(host: str, port: int, reuse_port: bool) -> socket.socket:
+    """Create and bind a non-blocking UDP socket.
+
+    Args:
+        host (str): IP address to bind to.
+        port (int): UDP port number.
+        reuse_port (bool): Set SO_REUSEPORT so multiple sockets can share
+            the port and the kernel spreads datagrams across them.
+
+    Returns:
+        socket.socket: The bound socket.
+    """
+    sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    if reuse_port:
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEPORT, 1)
+    # Large queues keep the kernel from dropping datagrams during bursts;
+    # sizes above net.core.*mem_max are clamped, so log what we really got.
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, _RCVBUF)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF, _SNDBUF)
+    logging.getLogger(__name__).debug(
+        "socket buffers: rcvbuf=%d sndbuf=%d",
+        sock.getsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF),
+        sock.getsockopt(socket.SOL_SOCKET, socket.SO_SNDBUF),
+    )
+    sock.bind((host, port))
+    sock.setblocking(False)
+    return sock
+
+
+def _sync_loop(config: Config, sock: socket.socket) -> None:
+    """Serve one blocking socket in a tight receive/respond loop.
+
+    Each thread owns its socket and responder (with its own scratch
+    buffer), so the loop runs without event-loop scheduling or selector
+    round-trips; the kernel parks the thread in recvfrom when idle. The
+    shared Config is safe here: `Config.load` is serialized behind a lock,
+    each index swap binds a fully built dict, and cross-index reads fall
+    back to empty results rather than assuming one generation.
+
+    Args:
+        config: Shared configuration and record index.
+        sock: Bound blocking UDP socket to serve.
+    """
+    logger = logging.getLogger(__name__)
+    responder = DNSResponder(config)
+    recvfrom = sock.recvfrom
+    sendto = sock.sendto
+    handle_into = responder.handle_into
+    while True:
+        try:
+            data, addr = recvfrom(_MAX_DGRAM)
+        except InterruptedError:
+            continue
+        except OSError as exc:
+            logger.warning("recvfrom failed: %s", exc)
+            return
+        # A bug in the handling path must not take the worker thread down
+        # with it — once every thread has died, serve_sync would exit
+        # cleanly while serving nothing.
+        try:
+            n = handle_into(data, addr)
+        except Exception:
+            logger.exception("error handling datagram from %s", addr)
+            continue
+        if not n:
+            continue
+        try:
+            sendto(memoryview(responder._scratch)[:n], addr)
+        except OSError as exc:
+            logger.warning("failed to send response to %s: %s", addr, exc)
+
+
+def serve_sync(
+    config_path: str,
+    host: str,
+    port: int,
+    log_level: str = "INFO",
+    workers: int | None = None,
+) -> NoReturn:
+    """Run the DNS server with blocking per-thread socket loops.
+
+    Alternative front end to `serve` that trades the event loop for one
+    thread per SO_REUSEPORT socket running `_sync_loop`. With no watcher
+    task to schedule, config reloads rely on the polled mtime check in the
+    datagram path.
+
+    Args:
+        config_path (str): Path to the YAML configuration file.
+        host (str): IP address to bind to.
+        port (int): UDP port number to listen on.
+        log_level (str, optional): Logging verbosity level. Defaults to "INFO".
+        workers (int | None, optional): Number of sockets/threads to run.
+            Defaults to the CPU count where SO_REUSEPORT is available, 1
+            otherwise.
+
+    Raises:
+        OSError: If the socket cannot be bound.
+    """
+    logging.basicConfig(
+        level=getattr(logging, log_level.upper(), logging.INFO),
+        format="%(asctime)s %(levelname)s %(name)s: %(message)s",
+    )
+    logger = logging.getLogger(__name__)
+
+    config = Config(config_path)
+
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    if workers is None:
+        workers = (os.cpu_count() or 1) if reuse_port else 1
+    workers = max(1, workers)
+
+    threads = []
+    for _ in range(workers):
+        sock = _make_socket(host, port, reuse_port and workers > 1)
+        sock.setblocking(True)
+        thread = threading.Thread(target=_sync_loop, args=(config, sock), daemon=True)
+        thread.start()
+        threads.append(thread)
+    logger.info("serving with %d thread(s) on %s:%d", len(threads), host, port)
+
+    for thread in threads:
+        thread.join()
+    raise SystemExit(0)
+
+
+async def serve(
+    config_path: str,
+    host: str,
+    port: int,
+    log_level: str = "INFO",
+    workers: int | None = None,
+) -> NoReturn:
     """Run the asynchronous UDP DNS server.
 
-    Initializes configuration, binds a UDP socket, and runs until cancelled.
+    Initializes configuration, binds one UDP socket per worker (with
+    SO_REUSEPORT where the platform supports it, so the kernel load-spreads
+    incoming datagrams), and runs until cancelled.
 
     Args:
         config_path (str): Path to the YAML configuration file.
         host (str): IP address to bind to.
         port (int): UDP port number to listen on.
         log_level (str, optional): Logging verbosity level. Defaults to "INFO".
+        workers (int | None, optional): Number of sockets/protocol instances
+            to bind. Defaults to the CPU count where SO_REUSEPORT is
+            available, 1 otherwise.
 
     Raises:
         OSError: If the socket cannot be bound.
@@ -32,12 +198,22 @@ async def serve(config_path: str, host: str, port: int, log_level: str = "INFO")
 
     config = Config(config_path)
     loop = asyncio.get_running_loop()
+    config.start_watcher(loop)
 
-    transport, _ = await loop.create_datagram_endpoint(
-        lambda: DNSUDPProtocol(config),
-        local_addr=(host, port),
-        family=socket.AF_INET,
-    )
+    reuse_port = hasattr(socket, "SO_REUSEPORT")
+    if workers is None:
+        workers = (os.cpu_count() or 1) if reuse_port else 1
+    workers = max(1, workers)
+
+    # Config is read-only between reloads, so one instance is shared by all
+    # readers.
+    readers = []
+    for _ in range(workers):
+        sock = _make_socket(host, port, reuse_port and workers > 1)
+        reader = DNSRawUDP(config, sock)
+        reader.attach(loop)
+        readers.append(reader)
+    logger.info("serving with %d socket(s) on %s:%d", len(readers), host, port)
 
     try:
         await asyncio.Future()
@@ -45,4 +221,5 @@ async def serve(config_path: str, host: str, port: int, log_level: str = "INFO")
         logger.info("server task cancelled")
     finally:
         logger.info("shutting down…")
-        transport.close()
+        for reader in readers:
+            reader.detach(loop)